@@ -1,30 +1,53 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
-import copy
+import contextlib
 import datetime
+import io
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Tuple, Optional, cast
+import sys
+import threading
+from typing import IO, Dict, Iterator, Optional, Tuple, cast
 import zipfile
 
-import gpxpy
-from gpxpy.gpx import GPX, GPXTrack, GPXTrackSegment
-from geopy.distance import distance
+import gpxpy.gpxfield as gpxfield
+import numpy as np
+from lxml import etree
+from numba import njit, prange, set_num_threads
 
+_EARTH_RADIUS_M = 6371000.0  # mean Earth radius used by the haversine formula
+_US = datetime.timedelta(microseconds=1)  # timestamp resolution
+_PARSERS = threading.local()  # per-thread lxml parser, see _xml_parser
+_KERNEL_LOCK = threading.Lock()  # numba's workqueue threading layer must not be entered from two threads at once
 
-def _hms(td: datetime.timedelta) -> str:
-    """Format a timedelta as “Hh Mm Ss”, omitting zero fields."""
 
-    total = int(round(td.total_seconds()))
-    h, rem = divmod(total, 3600)
-    m, s = divmod(rem, 60)
-    parts: list[str] = []
-    if h:
-        parts.append(f"{h}h")
-    if h or m:
-        parts.append(f"{m}m")
-    parts.append(f"{s}s")
-    return " ".join(parts)
+def _hms(s: int) -> str:
+    """Format *s* whole seconds as “Hh Mm Ss”, omitting leading zero fields."""
+
+    h, r = divmod(s, 3600)
+    m, x = divmod(r, 60)
+    return f"{h}h {m}m {x}s" if h else f"{m}m {x}s" if m else f"{x}s"
+
+
+def _secs(td: datetime.timedelta) -> int:
+    """Round a timedelta to whole seconds."""
+    return round(td.total_seconds())
+
+
+def format_duration(td: datetime.timedelta) -> str:
+    """Format a duration of the pause summary as “Hh Mm Ss”, omitting leading zero fields."""
+    return _hms(_secs(td))
+
+
+def format_clock(td: datetime.timedelta) -> str:
+    """Format a time offset of the pause summary as zero-padded “HH:MM:SS” (hours may exceed 24)."""
+    hh, rem = divmod(_secs(td), 3600)
+    mm, ss = divmod(rem, 60)
+    return f"{hh:02d}:{mm:02d}:{ss:02d}"
 
 
 def _print_pause_summary(stats: dict, *, tz_offset: int = 0) -> None:
@@ -42,33 +65,29 @@ def _print_pause_summary(stats: dict, *, tz_offset: int = 0) -> None:
     else:  # no pauses found
         t0 = None
 
-    print(f"Activity date  {stats['activity_start']:%Y-%m-%d}")
-    print(f"Start time  {stats['activity_start']:%H:%M:%S} UTC")
-    print(" ")
-    print(f"{'Pause':>5}  {'Relative time':>15}  {'Duration':>12}  " f"{'Removed':>12}  {'Drift':>9}")
+    rows = [
+        f"Activity date  {stats['activity_start']:%Y-%m-%d}",
+        f"Start time  {stats['activity_start']:%H:%M:%S} UTC",
+        " ",
+        f"{'Pause':>5}  {'Relative time':>15}  {'Duration':>12}  " f"{'Removed':>12}  {'Drift':>9}",
+    ]
 
     for i, p in enumerate(stats["pauses"], 1):
-        # Format Δt as HH:MM:SS (zero-padded, hours may exceed 24)
-        if t0 is not None:
-            rel_td = p["start"] - t0
-            total = int(round(rel_td.total_seconds()))
-            hh, rem = divmod(total, 3600)
-            mm, ss = divmod(rem, 60)
-            rel = f"{hh:02d}:{mm:02d}:{ss:02d}"
-        else:
-            rel = "—"
-
-        gap = _hms(p["gap"])
-        cut = _hms(p["removed"])
+        rel = format_clock(p["start"] - t0) if t0 is not None else "—"
+        gap = format_duration(p["gap"])
+        cut = format_duration(p["removed"])
         drift = f"{round(p['drift']):>3}m"
 
-        print(f"{i:>5}  {rel:>15}  {gap:>12}  {cut:>12}  {drift:>9}")
+        rows.append(f"{i:>5}  {rel:>15}  {gap:>12}  {cut:>12}  {drift:>9}")
 
-    print(" ")
-    print(f"Original elapsed time {_hms(stats['orig_elapsed']):>12}")
-    print(f"Trimmed elapsed time {_hms(stats['trimmed_elapsed']):>12}")
-    print(f"Total pause time {_hms(stats['removed_time']):>12}")
-    print("-" * 55)
+    rows += [
+        " ",
+        f"Original elapsed time {format_duration(stats['orig_elapsed']):>12}",
+        f"Trimmed elapsed time {format_duration(stats['trimmed_elapsed']):>12}",
+        f"Total pause time {format_duration(stats['removed_time']):>12}",
+        "-" * 55,
+    ]
+    sys.stdout.write("\n".join(rows) + "\n")
 
 
 def _decode_name(info: zipfile.ZipInfo) -> str:
@@ -93,21 +112,280 @@ def _ts(t: Optional[datetime.datetime]) -> datetime.datetime:
     return cast(datetime.datetime, t)
 
 
-def _trim_track(original: GPX, *, min_speed: float = 0.5, min_pause_duration: int = 600) -> Tuple[str, Dict]:
+def _epoch(t: datetime.datetime) -> float:
+    """Seconds since the epoch; naive times are read as UTC, not as the machine's local time."""
+    if t.tzinfo is None:
+        t = t.replace(tzinfo=datetime.timezone.utc)
+    return t.timestamp()
+
+
+def _haversine(lat1, lon1, lat2, lon2):
+    """Great-circle distance in metres between (lat1, lon1) and (lat2, lon2).
+
+    Works element-wise on NumPy arrays as well as on plain floats.
     """
-    Trim long, low-speed pauses from a GPX track and shift all subsequent
+    phi1, phi2 = np.radians(lat1), np.radians(lat2)
+    dphi = phi2 - phi1
+    dlam = np.radians(np.subtract(lon2, lon1))
+    a = np.sin(dphi / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(dlam / 2) ** 2
+    return 2 * _EARTH_RADIUS_M * np.arcsin(np.sqrt(a))
+
+
+@dataclass
+class _Segment:
+    """Track points of one ``<trkseg>``: their XML elements plus coordinates and times as arrays."""
+
+    points: list  # <trkpt> elements, edited in place
+    time_els: list  # their <time> children
+    times: list[datetime.datetime]
+    lat: np.ndarray  # degrees
+    lon: np.ndarray  # degrees
+    t: np.ndarray  # seconds since the epoch
+
+
+def _parse_fast(data: bytes) -> tuple[etree._Element, list[list[_Segment]]]:
+    """Parse GPX *data* with lxml, collecting the track points of every segment.
+
+    The raw bytes go straight to lxml, which honours the document's own encoding.
+    Only if that fails are invalid UTF-8 sequences replaced and parsing retried.
+
+    Returns:
+        root: The ``<gpx>`` element of the full document.
+        tracks: For every ``<trk>``, its segments in document order.
+    """
+    try:
+        return _read_tracks(data)
+    except etree.XMLSyntaxError:
+        repaired = data.decode("utf-8", errors="replace").encode("utf-8")
+        if repaired == data:  # not an encoding problem
+            raise
+        return _read_tracks(repaired)
+
+
+def _xml_parser() -> etree.XMLParser:
+    """Return this thread's reusable lxml parser (parsers must not be shared between threads)."""
+    try:
+        return _PARSERS.parser
+    except AttributeError:
+        _PARSERS.parser = etree.XMLParser(huge_tree=True)  # long multi-day tracks exceed libxml2's default limits
+        return _PARSERS.parser
+
+
+def _read_tracks(data: bytes) -> tuple[etree._Element, list[list[_Segment]]]:
+    """Single parse of *data* behind ``_parse_fast``."""
+    root = etree.fromstring(data, _xml_parser())
+    tracks: list[list[_Segment]] = []
+
+    for trk in root.iter("{*}trk"):
+        segments: list[_Segment] = []
+        for trkseg in trk.iter("{*}trkseg"):
+            points, time_els, times, lats, lons = [], [], [], [], []
+            for el in trkseg.iter("{*}trkpt"):
+                time_el = el.find(el.tag[: -len("trkpt")] + "time")  # same namespace as <trkpt>
+                text = time_el.text if time_el is not None else None
+                points.append(el)
+                time_els.append(time_el)
+                times.append(_ts(gpxfield.TIME_TYPE.from_string(text)))
+                lats.append(float(el.get("lat")))
+                lons.append(float(el.get("lon")))
+            t = np.fromiter((_epoch(p) for p in times), dtype=np.float64, count=len(times))
+            segments.append(_Segment(points, time_els, times, np.array(lats), np.array(lons), t))
+        tracks.append(segments)
+
+    return root, tracks
+
+
+# keep_pt, starts, ends, gaps, drifts, moved_d, moved_t ← lat, lon, t, min_speed, min_pause_duration
+_DETECT_PAUSES_SIG = "Tuple((b1[::1], i8[::1], i8[::1], f8[::1], f8[::1], f8[::1], f8[::1]))(f8[::1], f8[::1], f8[::1], f8, f8)"
+
+
+@njit(_DETECT_PAUSES_SIG, cache=True, fastmath=True, boundscheck=False)
+def _detect_pauses(lat, lon, t, min_speed, min_pause_duration):
+    """Find the soft pauses of one segment that are long enough to be removed.
+
+    Args:
+        lat, lon: Point coordinates in degrees.
+        t: Point timestamps in seconds since the epoch.
+        min_speed: Speed threshold in m s⁻¹.
+        min_pause_duration: Minimum pause length in seconds.
+
+    Returns:
+        keep_pt: Per-point mask, ``False`` for points inside a removed pause.
+        starts: Index of the point preceding each removed pause (its start time).
+        ends: Index of the first point written after each pause, ``len(t)`` if the
+            pause runs to the end of the segment.
+        gaps: Duration of each removed pause in seconds.
+        drifts: Distance drifted during each removed pause in metres.
+        moved_d, moved_t: Moving distance / time accumulated in this segment when
+            each pause ended; the extra last entry holds the segment totals.
+    """
+    n = t.shape[0]
+    keep_pt = np.ones(n, dtype=np.bool_)
+    starts = np.empty(n, dtype=np.int64)
+    ends = np.empty(n, dtype=np.int64)
+    gaps = np.empty(n, dtype=np.float64)
+    drifts = np.empty(n, dtype=np.float64)
+    moved_d = np.empty(n + 1, dtype=np.float64)
+    moved_t = np.empty(n + 1, dtype=np.float64)
+
+    # per-point latitude terms, shared by the two edges meeting at each point
+    phi = np.radians(lat)
+    cos_phi = np.cos(phi)
+
+    k = 0  # number of removed pauses
+    moving_dist = moving_time = 0.0
+    p_start = -1  # first low-speed pt index, -1 outside a pause
+    p_drift = 0.0
+    for i in range(1, n):
+        dt = t[i] - t[i - 1]
+        if dt <= 0:  # duplicate / rewind in source → always kept
+            continue
+
+        # instantaneous speed between two source points (haversine)
+        dlam = np.radians(lon[i] - lon[i - 1])
+        a = np.sin((phi[i] - phi[i - 1]) / 2) ** 2 + cos_phi[i - 1] * cos_phi[i] * np.sin(dlam / 2) ** 2
+        d_m = 2 * _EARTH_RADIUS_M * np.arcsin(np.sqrt(a))
+
+        if d_m / dt < min_speed:  # inside a soft pause
+            if p_start < 0:
+                p_start = i
+                p_drift = 0.0
+            p_drift += d_m
+            keep_pt[i] = False
+            continue
+
+        if p_start >= 0:  # leaving a soft pause
+            gap = t[i] - t[p_start - 1]
+            if gap >= min_pause_duration:
+                starts[k], ends[k], gaps[k], drifts[k] = p_start - 1, i, gap, p_drift
+                moved_d[k], moved_t[k] = moving_dist, moving_time
+                k += 1
+            else:  # pause too short → keep intact; point i is written once, after its pause
+                keep_pt[p_start:i] = True
+            p_start = -1
+
+        moving_dist += d_m
+        moving_time += dt
+
+    if p_start >= 0:  # soft pause that reaches end of segment
+        gap = t[n - 1] - t[p_start - 1]
+        if gap >= min_pause_duration:
+            starts[k], ends[k], gaps[k], drifts[k] = p_start - 1, n, gap, p_drift
+            moved_d[k], moved_t[k] = moving_dist, moving_time
+            k += 1
+        else:
+            keep_pt[p_start:] = True
+
+    moved_d[k], moved_t[k] = moving_dist, moving_time
+    return (
+        keep_pt,
+        starts[:k].copy(),
+        ends[:k].copy(),
+        gaps[:k].copy(),
+        drifts[:k].copy(),
+        moved_d[: k + 1].copy(),
+        moved_t[: k + 1].copy(),
+    )
+
+
+# keep_pt, starts, ends, gaps, drifts, moved_d, moved_t, counts ← lat, lon, t, offsets, min_speed, min_pause_duration
+_DETECT_ALL_SIG = (
+    "Tuple((b1[::1], i8[::1], i8[::1], f8[::1], f8[::1], f8[::1], f8[::1], i8[::1]))"
+    "(f8[::1], f8[::1], f8[::1], i8[::1], f8, f8)"
+)
+
+
+@njit(_DETECT_ALL_SIG, cache=True, fastmath=True, boundscheck=False, parallel=True)
+def _detect_all_segments(lat, lon, t, offsets, min_speed, min_pause_duration):
+    """Run ``_detect_pauses`` on many segments concurrently.
+
+    Segment ``s`` spans ``offsets[s]:offsets[s + 1]`` of the concatenated *lat*, *lon*
+    and *t*. Its results are stored in flat arrays: ``keep_pt`` over the same span,
+    its ``counts[s]`` pauses from ``offsets[s]`` on and its ``counts[s] + 1`` moving
+    totals from ``offsets[s] + s`` on.
+    """
+    n_seg = offsets.shape[0] - 1
+    n = t.shape[0]
+    keep_pt = np.empty(n, dtype=np.bool_)
+    starts = np.empty(n, dtype=np.int64)
+    ends = np.empty(n, dtype=np.int64)
+    gaps = np.empty(n, dtype=np.float64)
+    drifts = np.empty(n, dtype=np.float64)
+    moved_d = np.empty(n + n_seg, dtype=np.float64)
+    moved_t = np.empty(n + n_seg, dtype=np.float64)
+    counts = np.empty(n_seg, dtype=np.int64)
+
+    for s in prange(n_seg):  # segments are independent
+        a, b = offsets[s], offsets[s + 1]
+        keep, st, en, gp, dr, md, mt = _detect_pauses(lat[a:b], lon[a:b], t[a:b], min_speed, min_pause_duration)
+        k = st.shape[0]
+        keep_pt[a:b] = keep
+        starts[a : a + k] = st
+        ends[a : a + k] = en
+        gaps[a : a + k] = gp
+        drifts[a : a + k] = dr
+        moved_d[a + s : a + s + k + 1] = md
+        moved_t[a + s : a + s + k + 1] = mt
+        counts[s] = k
+
+    return keep_pt, starts, ends, gaps, drifts, moved_d, moved_t, counts
+
+
+def _detect_soft_pauses(segments: list[_Segment], *, min_speed: float, min_pause_duration: float) -> list[tuple]:
+    """Detect the soft pauses of all *segments* in one parallel kernel call.
+
+    Returns:
+        For every segment, the ``_detect_pauses`` result tuple.
+    """
+    if not segments:
+        return []
+    offsets = np.cumsum([0] + [len(seg.t) for seg in segments], dtype=np.int64)
+    with _KERNEL_LOCK:
+        keep_pt, starts, ends, gaps, drifts, moved_d, moved_t, counts = _detect_all_segments(
+            np.concatenate([seg.lat for seg in segments]),
+            np.concatenate([seg.lon for seg in segments]),
+            np.concatenate([seg.t for seg in segments]),
+            offsets,
+            float(min_speed),
+            float(min_pause_duration),
+        )
+
+    results = []
+    for s, (a, b, k) in enumerate(zip(offsets[:-1].tolist(), offsets[1:].tolist(), counts.tolist())):
+        pauses = slice(a, a + k)
+        moved = slice(a + s, a + s + k + 1)
+        results.append(
+            (keep_pt[a:b], starts[pauses], ends[pauses], gaps[pauses], drifts[pauses], moved_d[moved], moved_t[moved])
+        )
+    return results
+
+
+def warm_up() -> None:
+    """Run the pause kernel once on a tiny segment, starting numba's thread pool ahead of the first trim.
+
+    The kernels themselves are compiled (or loaded from the on-disk cache) when this
+    module is imported.
+    """
+    seg = _Segment([], [], [], np.zeros(2), np.zeros(2), np.array([0.0, 1.0]))
+    _detect_soft_pauses([seg], min_speed=0.1, min_pause_duration=1.0)
+
+
+def _trim_track(tracks: list[list[_Segment]], *, min_speed: float = 0.5, min_pause_duration: int = 600) -> Dict:
+    """
+    Trim long, low-speed pauses from GPX tracks and shift all subsequent
     timestamps backward so that *elapsed time equals true moving time*.
 
+    The XML elements of *tracks* are edited in place: removed points are
+    detached from their ``<trkseg>`` and every kept ``<time>`` is rewritten.
+
     Args:
-        original: The parsed GPX object to trim.
+        tracks: Segments per track, as returned by ``_parse_fast``.
         min_speed: Speed threshold, in m s⁻¹, below which motion is considered
             stationary.
         min_pause_duration: Minimum pause length, in seconds, that must be sustained
             before it is removed.
 
     Returns:
-        xml: The trimmed GPX, serialized as a single XML string with all
-            namespace information preserved.
         stats: A dictionary containing
             * ``pauses``        – list of removed-pause dicts
             * ``removed_time``  – total pause time as ``timedelta``
@@ -124,10 +402,7 @@ def _trim_track(original: GPX, *, min_speed: float = 0.5, min_pause_duration: in
             needed to traverse the straight- line distance at average speed and trim the excess.
         Returned `stats["pauses"]` rows therefore show gap ≥ removed ≥ 0  for **both** pause kinds.
     """
-    # ── boilerplate: deep-copy and bookkeeping ──────────────────────────────
-    trimmed = copy.deepcopy(original)
-    trimmed.tracks = []  # we rebuild tracks from scratch
-
+    # ── bookkeeping ─────────────────────────────────────────────────────────
     stats = {  # aggregate totals + pause list
         "pauses": [],  # list[dict]
         "removed_time": datetime.timedelta(),
@@ -135,138 +410,212 @@ def _trim_track(original: GPX, *, min_speed: float = 0.5, min_pause_duration: in
         "cum_shift": datetime.timedelta(),
     }
 
-    # helper: clone → time-shift → append, keeping timestamps strictly monotonic
-    def _append(dst_seg, src_pt, *, shift: datetime.timedelta, last_time: datetime.datetime | None):
-        new = copy.deepcopy(src_pt)
-        new.time -= shift  # apply global time shift
+    # helper: keep enough of a pause to cover its drift at v_avg, record and return the cut
+    def _remove_pause(*, start, gap: float, drift: float, v_avg: float) -> datetime.timedelta:
+        keep = drift / v_avg if v_avg else 1.0
+        keep = min(keep, gap)  # never > gap
+        cut = datetime.timedelta(seconds=gap - keep)
+
+        stats["pauses"].append(dict(start=start, gap=datetime.timedelta(seconds=gap), removed=cut, drift=drift))
+        stats["removed_time"] += cut
+        stats["pause_drift"] += drift
+        stats["cum_shift"] += cut
+        return cut
 
-        # GPX consumers need monotonically increasing timestamps
-        if last_time and new.time <= last_time:
-            new.time = last_time + datetime.timedelta(milliseconds=1)
-        dst_seg.points.append(new)
-        return new.time  # → becomes the next last_time
+    def _avg_speed(dist: float, time: float) -> float:
+        return dist / time if time else 0.0
 
     cum_shift = datetime.timedelta()  # total time removed so far
+    first_written = final_written = None  # output time span, for trimmed_elapsed
+
+    # soft pauses of every segment, detected up front (segments in parallel)
+    detected = iter(
+        _detect_soft_pauses(
+            [seg for segments in tracks for seg in segments],
+            min_speed=min_speed,
+            min_pause_duration=min_pause_duration,
+        )
+    )
 
     # ────────────────────────── iterate over tracks & segments ──────────────
-    for src_trk in original.tracks:
-        dst_trk = GPXTrack()
-        dst_trk.name = src_trk.name
-        dst_trk.type = src_trk.type
-        trimmed.tracks.append(dst_trk)
-
+    for segments in tracks:
         moving_dist = moving_time = 0.0  # for average-speed estimates
 
-        for seg_idx, src_seg in enumerate(src_trk.segments):
-            dst_seg = GPXTrackSegment()
-            dst_trk.segments.append(dst_seg)
-            if not src_seg.points:
+        # straight-line distance across every segment boundary of the track, in one call
+        heads = np.array([(s.lat[0], s.lon[0]) if s.points else (np.nan, np.nan) for s in segments]).reshape(-1, 2)
+        tails = np.array([(s.lat[-1], s.lon[-1]) if s.points else (np.nan, np.nan) for s in segments]).reshape(-1, 2)
+        gap_dists = _haversine(tails[:-1, 0], tails[:-1, 1], heads[1:, 0], heads[1:, 1])
+
+        for seg_idx, seg in enumerate(segments):
+            keep_pt, starts, ends, gaps, drifts, moved_d, moved_t = next(detected)
+            if not seg.points:
                 continue
 
-            last_written = _append(dst_seg, src_seg.points[0], shift=cum_shift, last_time=None)
-
-            # state for a potential soft pause
-            p_start_idx = None  # first low-speed pt index
-            p_start_time = None  # timestamp of preceding pt
-            p_drift = 0.0  # metres drifted during pause
-
-            pts = src_seg.points
-            for i in range(1, len(pts)):
-                prev, curr = pts[i - 1], pts[i]
-                dt = (_ts(curr.time) - _ts(prev.time)).total_seconds()
-                if dt <= 0:  # duplicate / rewind in source
-                    last_written = _append(dst_seg, curr, shift=cum_shift, last_time=last_written)
-                    continue
-
-                # instantaneous speed between two source points
-                d_m = distance((prev.latitude, prev.longitude), (curr.latitude, curr.longitude)).m
-                v = d_m / dt
-
-                # ── LOW-SPEED block ──────────────────────────────────────
-                if v < min_speed:  # inside a soft pause
-                    if p_start_idx is None:  # first time we dip below v_min
-                        p_start_idx, p_start_time = i, prev.time
-                        p_drift = 0.0
-                    p_drift += d_m
-                    continue
-
-                # ── LEAVING a soft pause ────────────────────────────────
-                if p_start_idx is not None:
-                    gap = _ts(curr.time) - _ts(p_start_time)
-
-                    if gap.total_seconds() >= min_pause_duration:
-                        # amount of that gap we must PRESERVE to maintain speed
-                        v_avg = moving_dist / moving_time if moving_time else 0.0
-                        keep = p_drift / v_avg if v_avg else 1.0
-                        keep = min(keep, gap.total_seconds())  # never > gap
-                        cut = gap - datetime.timedelta(seconds=keep)
-                        # record stats
-                        stats["pauses"].append(dict(start=p_start_time, gap=gap, removed=cut, drift=p_drift))
-                        stats["removed_time"] += cut
-                        stats["pause_drift"] += p_drift
-                        stats["cum_shift"] += cut
-                        cum_shift += cut
-                    else:  # pause too short → keep intact
-                        for j in range(p_start_idx, i + 1):
-                            last_written = _append(dst_seg, pts[j], shift=cum_shift, last_time=last_written)
-
-                    p_start_idx = p_start_time = None
-                    p_drift = 0.0
-
-                # point is normal moving data
-                last_written = _append(dst_seg, curr, shift=cum_shift, last_time=last_written)
-                moving_dist += d_m
-                moving_time += dt
-
-            # ── SOFT pause that reaches end of segment ──────────────────
-            if p_start_idx is not None:
-                gap = _ts(pts[-1].time) - _ts(p_start_time)
-                if gap.total_seconds() >= min_pause_duration:
-                    v_avg = moving_dist / moving_time if moving_time else 0.0
-                    keep = p_drift / v_avg if v_avg else 1.0
-                    keep = min(keep, gap.total_seconds())
-                    cut = gap - datetime.timedelta(seconds=keep)
-
-                    stats["pauses"].append(dict(start=p_start_time, gap=gap, removed=cut, drift=p_drift))
-                    stats["removed_time"] += cut
-                    stats["pause_drift"] += p_drift
-                    stats["cum_shift"] += cut
-                    cum_shift += cut
-                else:  # short pause → keep
-                    for j in range(p_start_idx, len(pts)):
-                        last_written = _append(dst_seg, pts[j], shift=cum_shift, last_time=last_written)
+            if first_written is None:  # the first point is always kept and no cut precedes it
+                first_written = seg.times[0] - cum_shift
+
+            # kept points between consecutive pause ends share one shift (in µs); a pause
+            # that reaches the end of the segment leaves an empty last block
+            kept = np.flatnonzero(keep_pt)
+            blocks = np.diff(np.searchsorted(kept, ends), prepend=0, append=len(kept))
+            block_shift = np.empty(len(blocks), dtype=np.int64)
+            block_shift[0] = cum_shift // _US
+            for j in range(len(ends)):
+                cum_shift += _remove_pause(
+                    start=seg.times[starts[j]],
+                    gap=float(gaps[j]),
+                    drift=float(drifts[j]),
+                    v_avg=_avg_speed(moving_dist + moved_d[j], moving_time + moved_t[j]),
+                )
+                block_shift[j + 1] = cum_shift // _US
+
+            # GPX consumers need strictly increasing timestamps: write every point at least
+            # 1 ms after the previous one, out[i] = max(t[i] - shift[i], out[i-1] + 1 ms)
+            t_us = np.rint(seg.t[kept] * 1e6).astype(np.int64)
+            step = 1000 * np.arange(len(kept), dtype=np.int64)
+            new_us = np.maximum.accumulate(t_us - np.repeat(block_shift, blocks) - step) + step
+            for i, back in zip(kept.tolist(), (t_us - new_us).tolist()):
+                final_written = seg.times[i] - datetime.timedelta(microseconds=back)
+                seg.time_els[i].text = gpxfield.format_time(final_written)
+
+            for i in np.flatnonzero(~keep_pt):
+                pt = seg.points[i]
+                pt.getparent().remove(pt)
+
+            moving_dist += moved_d[-1]
+            moving_time += moved_t[-1]
 
             # ── HARD pause (gap between segments) ───────────────────────
             nxt = seg_idx + 1
-            if nxt < len(src_trk.segments) and src_trk.segments[nxt].points:
-                last_pt = src_seg.points[-1]
-                first_nx = src_trk.segments[nxt].points[0]
-                dt_gap = (_ts(first_nx.time) - _ts(last_pt.time)).total_seconds()
+            if nxt < len(segments) and segments[nxt].points:
+                nx = segments[nxt]
+                dt_gap = nx.t[0] - seg.t[-1]
                 if dt_gap >= min_pause_duration:
-                    d_gap = distance((last_pt.latitude, last_pt.longitude), (first_nx.latitude, first_nx.longitude)).m
-                    v_avg = moving_dist / moving_time if moving_time else 0.0
-                    keep = d_gap / v_avg if v_avg else 1.0
-                    keep = min(keep, dt_gap)
-                    cut = datetime.timedelta(seconds=dt_gap - keep)
-
-                    stats["pauses"].append(
-                        dict(start=last_pt.time, gap=datetime.timedelta(seconds=dt_gap), removed=cut, drift=d_gap)
+                    cum_shift += _remove_pause(
+                        start=seg.times[-1],
+                        gap=float(dt_gap),
+                        drift=float(gap_dists[seg_idx]),
+                        v_avg=_avg_speed(moving_dist, moving_time),
                     )
-                    stats["removed_time"] += cut
-                    stats["pause_drift"] += d_gap
-                    stats["cum_shift"] += cut
-                    cum_shift += cut
 
     # ── overall elapsed times ───────────────────────────────────────────
-    stats["activity_start"] = _ts(original.tracks[0].segments[0].points[0].time)
-    stats["orig_elapsed"] = _ts(original.tracks[-1].segments[-1].points[-1].time) - _ts(
-        original.tracks[0].segments[0].points[0].time
-    )
-    stats["trimmed_elapsed"] = _ts(trimmed.tracks[-1].segments[-1].points[-1].time) - _ts(
-        trimmed.tracks[0].segments[0].points[0].time
-    )
+    stats["activity_start"] = tracks[0][0].times[0]
+    stats["orig_elapsed"] = tracks[-1][-1].times[-1] - tracks[0][0].times[0]
+    stats["trimmed_elapsed"] = _ts(final_written) - _ts(first_written)
+
+    return stats
+
+
+def _serialize_trimmed(root: etree._Element, fp: IO[bytes]) -> None:
+    """Write the (trimmed) GPX document *root* as pretty-printed UTF-8 XML into *fp*.
+
+    lxml's incremental writer streams the serialized tree straight into *fp*, so
+    the document is never held in memory as one string.
+    """
+    etree.indent(root, space="  ")
+    with etree.xmlfile(fp, encoding="utf-8") as xf:
+        xf.write_declaration()
+        xf.write(root)
+
+
+def _init_worker() -> None:
+    """Keep each pool process single-threaded; the pool itself already keeps every CPU busy."""
+    set_num_threads(1)
+
+
+def _trim_blob(job: Tuple[bytes, float, int]) -> Tuple[bytes, Dict]:
+    """Trim one GPX document and return the serialized result with its stats.
+
+    Module-level (and taking a single tuple) so ``ProcessPoolExecutor.map`` can
+    ship it to worker processes.
+    """
+    data, min_speed, min_pause_duration = job
+    root, tracks = _parse_fast(data)
+    stats = _trim_track(tracks, min_speed=min_speed, min_pause_duration=min_pause_duration)
+
+    out = io.BytesIO()
+    _serialize_trimmed(root, out)
+    return out.getvalue(), stats
+
+
+def _trim_zip(
+    zin: zipfile.ZipFile,
+    out: str | Path | IO[bytes],
+    *,
+    min_speed: float,
+    min_pause_duration: int,
+    max_workers: int | None,
+) -> Iterator[Tuple[str, Dict]]:
+    """Trim every GPX file of *zin* into a new archive written to *out*.
+
+    Yields the ``(label, stats)`` of each file once it is written; the archive is
+    complete when the generator is exhausted.
+    """
+    # deflate level 1: nearly the size of the default level at a fraction of the zlib time
+    with zipfile.ZipFile(out, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=1) as zout:
+
+        # walk all entries, collecting the GPX files
+        names: list[Tuple[str, str]] = []  # (label, output name)
+        jobs: list[Tuple[bytes, float, int]] = []
+        for member in zin.infolist():
+            arcname = _decode_name(member)  # repaired text
+            p = Path(arcname)
+
+            # skip non-GPX or macOS “resource-fork” files
+            if p.suffix.lower() != ".gpx" or p.name.startswith("._"):
+                continue
 
-    return trimmed.to_xml(prettyprint=True), stats
+            names.append((p.name, p.with_stem(p.stem + "_trimmed").as_posix()))
+            jobs.append((zin.read(member), min_speed, min_pause_duration))
+
+        # trim → write back; files are independent, so trim them in parallel. Workers are
+        # spawned, not forked: a fork would copy numba's thread pool and locks held by
+        # other threads of this process (e.g. other Streamlit sessions). Each one first
+        # imports numba, lxml and gpxpy, so a pool only pays off with two or more workers.
+        workers = min(max_workers or os.cpu_count() or 1, len(jobs))
+        spawn = multiprocessing.get_context("spawn")
+        pool = ProcessPoolExecutor(workers, mp_context=spawn, initializer=_init_worker) if workers > 1 else None
+        with pool or contextlib.nullcontext() as ex:
+            results = ex.map(_trim_blob, jobs) if pool is not None else map(_trim_blob, jobs)
+            for (label, out_name), (xml_out, stats) in zip(names, results):
+                zout.writestr(out_name, xml_out)
+                yield label, stats
+
+
+def run_pause_trimmer_bytes(
+    data: bytes,
+    filename: str,
+    *,
+    min_speed: float = 0.1,
+    min_pause_duration: int = 240,
+    max_workers: int | None = None,
+) -> Tuple[bytes, str, list]:
+    """
+    In-memory variant of ``run_pause_trimmer``, e.g. for uploaded files.
+
+    Args:
+        data: Contents of a single ``.gpx`` file or of a ``.zip`` containing many GPX files.
+        filename: Name of the file; a ``.zip`` suffix selects archive handling.
+        min_speed, min_pause_duration, max_workers : As for ``run_pause_trimmer``.
+
+    Returns:
+        out_bytes: The trimmed GPX file or ZIP archive.
+        out_name: Its file name, *filename* with ``_trimmed`` appended to the stem.
+        report: A ``(label, stats)`` tuple for every trimmed file.
+    """
+    name = Path(filename)
+    out_name = name.with_stem(name.stem + "_trimmed").name
+
+    if name.suffix.lower() != ".zip":
+        out_bytes, stats = _trim_blob((data, min_speed, min_pause_duration))
+        return out_bytes, out_name, [(name.name, stats)]
+
+    out = io.BytesIO()
+    with zipfile.ZipFile(io.BytesIO(data)) as zin:
+        report = list(
+            _trim_zip(zin, out, min_speed=min_speed, min_pause_duration=min_pause_duration, max_workers=max_workers)
+        )
+    return out.getvalue(), out_name, report
 
 
 def run_pause_trimmer(
@@ -274,6 +623,8 @@ def run_pause_trimmer(
     *,
     min_speed: float = 0.1,
     min_pause_duration: int = 240,
+    max_workers: int | None = None,
+    report: list | None = None,
 ) -> None:
     """
     Trim every GPX track in *input_path*.
@@ -283,26 +634,39 @@ def run_pause_trimmer(
             files (any sub-folder layout is preserved).
         min_speed : Low-speed threshold in m s⁻¹ (default 0.1).
         min_pause_duration : Minimum pause duration in seconds before it is removed (default 600).
+        max_workers : Worker processes used for the files of a ``.zip`` (default: one per
+            CPU, at most one per file); ``1`` trims them one after another in this process,
+            as does a single-CPU host.
+        report : If given, a ``(label, stats)`` tuple is appended for every trimmed file
+            instead of printing its summary; nothing is printed at all.
     """
     input_path = Path(input_path)
 
     # ── helper for one GPX blob ────────────────────────────────────
-    def _trim_and_report(xml: str, label: str) -> str:
-        gpx = gpxpy.parse(xml)
-        xml_out, stats = _trim_track(gpx, min_speed=min_speed, min_pause_duration=min_pause_duration)
-
+    def _trim_and_report(data: bytes, label: str, fp: IO[bytes]) -> None:
+        root, tracks = _parse_fast(data)
+        stats = _trim_track(tracks, min_speed=min_speed, min_pause_duration=min_pause_duration)
+        _serialize_trimmed(root, fp)
+        _report(label, stats)
+
+    def _report(label: str, stats: Dict) -> None:
+        if report is not None:
+            report.append((label, stats))
+            return
         print(f"\n=== {label} ===\n")
         _print_pause_summary(stats, tz_offset=0)
-        return xml_out
+
+    def _print(msg: str) -> None:
+        if report is None:
+            print(msg)
 
     # ── single GPX on disk ────────────────────────────────────────
     if input_path.suffix.lower() != ".zip":
-        xml_in = input_path.read_text(encoding="utf-8", errors="replace")
-        xml_out = _trim_and_report(xml_in, input_path.name)
-
+        data = input_path.read_bytes()
         out_file = input_path.with_stem(input_path.stem + "_trimmed")
-        out_file.write_text(xml_out, encoding="utf-8")
-        print(f"\nCreated {out_file.name}")
+        with out_file.open("wb") as fp:
+            _trim_and_report(data, input_path.name, fp)
+        _print(f"\nCreated {out_file.name}")
 
         return
 
@@ -310,29 +674,18 @@ def run_pause_trimmer(
     out_zip = input_path.with_stem(input_path.stem + "_trimmed")
     trimmed_count = 0
 
-    with zipfile.ZipFile(input_path) as zin, zipfile.ZipFile(out_zip, "w", compression=zipfile.ZIP_DEFLATED) as zout:
-
-        # walk all entries
-        for member in zin.infolist():
-            arcname = _decode_name(member)  # repaired text
-            p = Path(arcname)
-
-            # skip non-GPX or macOS “resource-fork” files
-            if p.suffix.lower() != ".gpx" or p.name.startswith("._"):
-                continue
-
-            # read → trim → write back
-            xml_in = zin.read(member).decode("utf-8", errors="replace")
-            xml_out = _trim_and_report(xml_in, p.name)
-
-            out_name = p.with_stem(p.stem + "_trimmed").as_posix()
-            zout.writestr(out_name, xml_out.encode("utf-8"))
+    with zipfile.ZipFile(input_path) as zin:
+        trimmed = _trim_zip(
+            zin, out_zip, min_speed=min_speed, min_pause_duration=min_pause_duration, max_workers=max_workers
+        )
+        for label, stats in trimmed:
+            _report(label, stats)
             trimmed_count += 1
 
     if trimmed_count:
-        print(f"\nCreated {out_zip.name} with {trimmed_count} trimmed track(s).")
+        _print(f"\nCreated {out_zip.name} with {trimmed_count} trimmed track(s).")
     else:
-        print("No .gpx files found in the archive.")
+        _print("No .gpx files found in the archive.")
 
 
 if __name__ == "__main__":
@@ -353,7 +706,18 @@ if __name__ == "__main__":
         type=int,
         help="Minimum pause duration in seconds; pauses longer than this will be trimmed.",
     )
+    parser.add_argument(
+        "--max_workers",
+        default=None,
+        type=int,
+        help="Worker processes used to trim the files of a ZIP archive (default: one per CPU).",
+    )
     parser.add_argument("input_file_path", help="Input file path")
     args = parser.parse_args()
 
-    run_pause_trimmer(args.input_file_path, min_speed=args.min_speed, min_pause_duration=args.min_pause_duration)
+    run_pause_trimmer(
+        args.input_file_path,
+        min_speed=args.min_speed,
+        min_pause_duration=args.min_pause_duration,
+        max_workers=args.max_workers,
+    )
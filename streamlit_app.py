@@ -4,7 +4,7 @@ Streamlit GPX Trimmer app
 Run with:
     streamlit run streamlit_app.py
 
-The app wraps the ``run_pause_trimmer`` function from *gpx_trimmer.py* to
+The app wraps the ``run_pause_trimmer_bytes`` function from *gpx_trimmer.py* to
 trim long pauses from a single GPX track or a batch of tracks inside a ZIP
 archive. Users can adjust the low‑speed threshold and minimum pause
 duration used to identify long pauses.
@@ -12,14 +12,57 @@ duration used to identify long pauses.
 
 from __future__ import annotations
 
-import contextlib
-import io
-import tempfile
-from pathlib import Path
+import multiprocessing
 
+import numba
+import pandas as pd
 import streamlit as st
 
-from gpx_trimmer import run_pause_trimmer
+# Streamlit runs this script on worker threads; a TBB thread pool started from one of
+# them hangs the server on shutdown, so prefer workqueue unless a layer was chosen.
+if numba.config.THREADING_LAYER == "default":
+    numba.config.THREADING_LAYER = "workqueue"
+
+from gpx_trimmer import format_clock, format_duration, run_pause_trimmer_bytes, warm_up
+
+
+@st.cache_resource(show_spinner=False)
+def _warm_up() -> None:
+    """Start the pause kernel's thread pool once per server, so the first *Trim* click does not pay for it."""
+    warm_up()
+
+
+# ZIP workers are spawned processes that re-import this script as ``__mp_main__``;
+# they run single-threaded and must not start the thread pool.
+if multiprocessing.parent_process() is None:
+    _warm_up()
+
+
+def _show_summary(label: str, stats: dict) -> None:
+    """Render the pause summary of one trimmed file."""
+
+    start = stats["activity_start"]
+    st.markdown(f"**{label}**")
+    st.caption(f"Activity date {start:%Y-%m-%d}, start time {start:%H:%M:%S} UTC")
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Original elapsed time", format_duration(stats["orig_elapsed"]))
+    col2.metric("Trimmed elapsed time", format_duration(stats["trimmed_elapsed"]))
+    col3.metric("Total pause time", format_duration(stats["removed_time"]))
+
+    if stats["pauses"]:
+        pauses = pd.DataFrame(
+            {
+                "Relative time": [format_clock(p["start"] - start) for p in stats["pauses"]],
+                "Duration": [format_duration(p["gap"]) for p in stats["pauses"]],
+                "Removed": [format_duration(p["removed"]) for p in stats["pauses"]],
+                "Drift (m)": [round(p["drift"]) for p in stats["pauses"]],
+            },
+            index=pd.RangeIndex(1, len(stats["pauses"]) + 1, name="Pause"),
+        )
+        st.dataframe(pauses)
+    else:
+        st.caption("No long pauses found.")
 
 
 def main() -> None:
@@ -67,7 +110,7 @@ def main() -> None:
         "* Adjust the **low‑speed threshold** and **minimum pause duration** to define what is considered a"
         " long pause.\n"
         "* Click **Trim**; the processed file will be offered for download. You can also see the processing summary"
-        " in the text area below.\n"
+        " below.\n"
     )
     st.markdown("---")
 
@@ -99,40 +142,25 @@ def main() -> None:
     # ── Process button ────────────────────────────────────────────────
     if uploaded_file is not None and st.button("Trim"):
         with st.spinner("Processing... this may take a moment ☕"):
-            # Save the upload to a temporary file so run_pause_trimmer can work with paths.
-            with tempfile.TemporaryDirectory() as tmpdir:
-                in_path = Path(tmpdir) / uploaded_file.name
-                in_path.write_bytes(uploaded_file.getbuffer())
-
-                # Capture stdout from run_pause_trimmer so we can show it in the UI.
-                log_stream = io.StringIO()
-                with contextlib.redirect_stdout(log_stream):
-                    run_pause_trimmer(
-                        str(in_path),
-                        min_speed=float(min_speed),
-                        min_pause_duration=int(min_pause),
-                    )
-                log_text = log_stream.getvalue()
-
-                # Determine where the trimmed file was written.
-                out_path = in_path.with_stem(in_path.stem + "_trimmed")
-
-                if not out_path.exists():
-                    st.error("Processing completed but the trimmed file could not be found.")
-                    st.code(log_text)
-                    return
-
-                # Read the trimmed GPX/ZIP for download.
-                trimmed_data = out_path.read_bytes()
-                mime = "application/zip" if out_path.suffix.lower() == ".zip" else "application/gpx+xml"
+            # Trim the upload in memory; the result goes straight to the download button.
+            trimmed_data, out_name, report = run_pause_trimmer_bytes(
+                uploaded_file.getvalue(),
+                uploaded_file.name,
+                min_speed=float(min_speed),
+                min_pause_duration=int(min_pause),
+            )
+            mime = "application/zip" if out_name.lower().endswith(".zip") else "application/gpx+xml"
 
         # ── Display results ───────────────────────────────────────────
         st.success("Done! See the summary below and download your trimmed file(s).")
-        st.code(log_text, language="text")
+        if not report:
+            st.warning("No .gpx files found in the archive.")
+        for label, stats in report:
+            _show_summary(label, stats)
         st.download_button(
             label="📥 Download trimmed file(s)",
             data=trimmed_data,
-            file_name=out_path.name,
+            file_name=out_name,
             mime=mime,
         )
 
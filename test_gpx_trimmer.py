@@ -0,0 +1,124 @@
+"""Regression tests for the pause trimmer: pause counts, removed time and written timestamps.
+
+Points move 0.0001° of latitude (≈11.1 m) per 10 s step, i.e. ≈1.1 m s⁻¹, or stand still;
+all tracks are trimmed with the defaults (``min_speed=0.1``, ``min_pause_duration=240``).
+
+Run with:
+    python -m pytest test_gpx_trimmer.py
+"""
+
+from __future__ import annotations
+
+import datetime
+import time
+
+import pytest
+from lxml import etree
+
+from gpx_trimmer import run_pause_trimmer_bytes
+
+_START = datetime.datetime(2024, 5, 1, 10, 0, 0)
+
+
+def _gpx(segments: list[list[tuple[int, float]]], *, utc: bool, start: datetime.datetime = _START) -> bytes:
+    """Build a one-track GPX document from ``(seconds after start, latitude)`` points per segment."""
+    suffix = "Z" if utc else ""
+    trksegs = "".join(
+        "<trkseg>"
+        + "".join(
+            f'<trkpt lat="{lat}" lon="8.0">'
+            f"<time>{start + datetime.timedelta(seconds=t):%Y-%m-%dT%H:%M:%S}{suffix}</time></trkpt>"
+            for t, lat in seg
+        )
+        + "</trkseg>"
+        for seg in segments
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<gpx version="1.1" creator="test" xmlns="http://www.topografix.com/GPX/1/1">'
+        f"<trk>{trksegs}</trk></gpx>"
+    ).encode("utf-8")
+
+
+def _trim(segments: list[list[tuple[int, float]]], **kwargs) -> tuple[dict, list[str]]:
+    """Trim the track and return its stats and the written ``<time>`` texts."""
+    out, out_name, report = run_pause_trimmer_bytes(_gpx(segments, **kwargs), "track.gpx")
+    assert out_name == "track_trimmed.gpx"
+    [(_, stats)] = report
+    return stats, [el.text for el in etree.fromstring(out).iter("{*}time")]
+
+
+def _written(*times: str, utc: bool) -> list[str]:
+    return [f"2024-05-01T{t}{'Z' if utc else ''}" for t in times]
+
+
+@pytest.mark.parametrize("utc", [True, False], ids=["Z", "naive"])
+def test_short_soft_pause_is_kept(utc):
+    # 40 s standing still at 10:00:20 is shorter than min_pause_duration
+    track = [
+        [(0, 47.0), (10, 47.0001), (20, 47.0002), (30, 47.0002), (40, 47.0002), (50, 47.0002)]
+        + [(60, 47.0003), (70, 47.0004)]
+    ]
+    stats, times = _trim(track, utc=utc)
+
+    assert stats["pauses"] == []
+    assert stats["removed_time"] == datetime.timedelta(0)
+    assert stats["trimmed_elapsed"] == datetime.timedelta(seconds=70)
+    assert times == _written(
+        "10:00:00", "10:00:10", "10:00:20", "10:00:30", "10:00:40", "10:00:50", "10:01:00", "10:01:10", utc=utc
+    )
+
+
+@pytest.mark.parametrize("utc", [True, False], ids=["Z", "naive"])
+def test_long_soft_pause_is_removed(utc):
+    # 310 s standing still: no drift, so the whole pause is cut and its stationary points dropped
+    track = [
+        [(0, 47.0), (10, 47.0001), (20, 47.0002)]
+        + [(20 + 60 * k, 47.0002) for k in range(1, 6)]
+        + [(330, 47.0003), (340, 47.0004)]
+    ]
+    stats, times = _trim(track, utc=utc)
+
+    [pause] = stats["pauses"]
+    assert pause["gap"] == datetime.timedelta(seconds=310)
+    assert pause["removed"] == datetime.timedelta(seconds=310)
+    assert pause["drift"] == 0.0
+    assert stats["removed_time"] == datetime.timedelta(seconds=310)
+    assert stats["orig_elapsed"] == datetime.timedelta(seconds=340)
+    assert stats["trimmed_elapsed"] == datetime.timedelta(seconds=30)
+    # the point ending the pause would land on its start; it is written 1 ms later instead
+    assert times == _written("10:00:00", "10:00:10", "10:00:20", "10:00:20.001000", "10:00:30", utc=utc)
+
+
+@pytest.mark.parametrize("utc", [True, False], ids=["Z", "naive"])
+def test_hard_pause_keeps_time_to_cover_its_distance(utc):
+    # 1000 s between segments across one 11.1 m step: 10 s at the average speed are kept
+    track = [[(0, 47.0), (10, 47.0001), (20, 47.0002)], [(1020, 47.0003), (1030, 47.0004)]]
+    stats, times = _trim(track, utc=utc)
+
+    [pause] = stats["pauses"]
+    assert pause["gap"] == datetime.timedelta(seconds=1000)
+    assert pause["removed"] == datetime.timedelta(seconds=990)
+    assert pause["drift"] == pytest.approx(11.12, abs=0.01)
+    assert stats["removed_time"] == datetime.timedelta(seconds=990)
+    assert stats["trimmed_elapsed"] == datetime.timedelta(seconds=40)
+    assert times == _written("10:00:00", "10:00:10", "10:00:20", "10:00:30", "10:00:40", utc=utc)
+
+
+@pytest.mark.skipif(not hasattr(time, "tzset"), reason="needs time.tzset")
+def test_naive_times_ignore_local_dst(monkeypatch):
+    # naive times across the 2024-03-31 02:00 switch to summer time in Zurich: the 4800 s
+    # wall-clock gap must not shrink by the hour the local clock skips
+    monkeypatch.setenv("TZ", "Europe/Zurich")
+    time.tzset()
+    try:
+        track = [[(0, 47.0), (10, 47.0001), (20, 47.0002)], [(4820, 47.0003), (4830, 47.0004)]]
+        stats, times = _trim(track, utc=False, start=datetime.datetime(2024, 3, 31, 1, 50, 0))
+    finally:
+        monkeypatch.undo()
+        time.tzset()
+
+    [pause] = stats["pauses"]
+    assert pause["gap"] == datetime.timedelta(seconds=4800)
+    assert stats["removed_time"] == datetime.timedelta(seconds=4790)
+    assert times == [f"2024-03-31T01:50:{s}" for s in ("00", "10", "20", "30", "40")]